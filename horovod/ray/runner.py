@@ -1,5 +1,6 @@
 import ray
 
+import functools
 import warnings
 from collections import defaultdict
 from dataclasses import dataclass
@@ -9,10 +10,28 @@ import logging
 
 from horovod.runner.common.util import secret, timeout, hosts
 from horovod.runner.http.http_server import RendezvousServer
-from horovod.ray.utils import detect_nics, nics_to_env_var, map_blocking
+from horovod.runner.util.threads import in_thread
+from horovod.ray.utils import (detect_nics, nics_to_env_var, map_blocking,
+                               put_if_large)
 from horovod.ray.strategy import ColocatedStrategy, PackStrategy
 logger = logging.getLogger(__name__)
 
+# IP address of the driver node. Looked up once per process since
+# `RayExecutor` may be started and shut down many times (e.g. in tuning).
+_DRIVER_IP = None
+
+
+def _get_driver_ip() -> str:
+    global _DRIVER_IP
+    if _DRIVER_IP is None:
+        _DRIVER_IP = ray.util.get_node_ip_address()
+    return _DRIVER_IP
+
+
+def _apply(fn: Callable, args: List, kwargs: Dict, executable: Any) -> Any:
+    """Invokes `fn` with the given arguments, ignoring the executable."""
+    return fn(*args, **kwargs)
+
 
 @dataclass
 class MiniSettings:
@@ -53,52 +72,136 @@ class Coordinator:
             settings,
     ):
         self.settings = settings
-        self.hostnames_by_rank = defaultdict(list)
+        # Hostname and world rank of each registered worker, in order of
+        # registration.
+        self._hostnames = []
+        self._world_ranks = []
+        # Grouping of the registrations by node, reset on every `register`.
+        self._nodes = None
+        self._hoststring = None
 
     @property
     def world_size(self) -> int:
-        return sum(len(ranks) for ranks in self.hostnames_by_rank.values())
+        return len(self._world_ranks)
+
+    @property
+    def node_hostnames(self) -> List[str]:
+        """Hostname of each node, in order of first registration."""
+        return list(self._group_by_node()[0])
+
+    @property
+    def hostnames_by_rank(self) -> Dict[str, List[int]]:
+        """Read-only snapshot of the world ranks registered on each host.
+
+        Changes to it are not reflected in the coordinator.
+        """
+        return {
+            hostname: list(ranks)
+            for hostname, ranks in zip(*self._group_by_node())
+        }
 
     @property
     def hoststring(self) -> str:
-        return ",".join([
-            f"{host}:{len(ranks)}"
-            for host, ranks in self.hostnames_by_rank.items()
-        ])
+        # Computed once after registration and reset on every `register`.
+        if self._hoststring is None:
+            self._hoststring = ",".join(
+                f"{host}:{len(ranks)}"
+                for host, ranks in zip(*self._group_by_node()))
+        return self._hoststring
 
     def register(self, hostname: str, world_rank: int):
-        self.hostnames_by_rank[hostname].append(world_rank)
+        self._hostnames.append(hostname)
+        self._world_ranks.append(world_rank)
+        self._nodes = None
+        self._hoststring = None
+
+    def register_all(self, hostnames: List[str]):
+        """Registers all workers at once, where rank i runs on hostnames[i].
+
+        Must be called on a coordinator without any registered workers.
+        """
+        assert not self._world_ranks, (
+            "register_all cannot be combined with other registrations.")
+        self._hostnames.extend(hostnames)
+        self._world_ranks.extend(range(len(hostnames)))
+        self._nodes = None
+        self._hoststring = None
+
+    def _group_by_node(self):
+        """Groups the registered workers by hostname.
+
+        Nodes are ordered by the first registration on each of them. The
+        grouping is computed once and reused until the next registration.
+
+        Returns:
+            Hostname of each node and the world ranks on each node, in
+            order of registration.
+        """
+        if self._nodes is None:
+            node_indices = {}
+            node_hostnames = []
+            node_ranks = []
+            for hostname, world_rank in zip(self._hostnames,
+                                            self._world_ranks):
+                node_index = node_indices.get(hostname)
+                if node_index is None:
+                    node_index = node_indices[hostname] = len(node_hostnames)
+                    node_hostnames.append(hostname)
+                    node_ranks.append([])
+                node_ranks[node_index].append(world_rank)
+            self._nodes = (node_hostnames, node_ranks)
+        return self._nodes
 
     def finalize_registration(self) -> dict:
         """Return a dictionary for all ranks."""
-        rank_to_info = {}
+        _, node_ranks = self._group_by_node()
 
+        # Cross rank is the number of preceding nodes with the local rank.
         cross_sizes = defaultdict(int)
         cross_ranks = {}
-        for rank_list in self.hostnames_by_rank.values():
-            for local_rank, world_rank in enumerate(rank_list):
+        for ranks in node_ranks:
+            for local_rank, world_rank in enumerate(ranks):
                 cross_ranks[world_rank] = cross_sizes[local_rank]
                 cross_sizes[local_rank] += 1
 
-        for node_world_rank, (hostname, ranks) in enumerate(
-                self.hostnames_by_rank.items()):
-            for local_rank, world_rank in enumerate(ranks):
-                rank_to_info[world_rank] = dict(
-                    HOROVOD_CROSS_RANK=cross_ranks[world_rank],
-                    HOROVOD_CROSS_SIZE=cross_sizes[local_rank],
-                    HOROVOD_LOCAL_RANK=local_rank,
-                    HOROVOD_LOCAL_SIZE=len(ranks))
-        return rank_to_info
+        return {
+            world_rank: dict(
+                HOROVOD_CROSS_RANK=cross_ranks[world_rank],
+                HOROVOD_CROSS_SIZE=cross_sizes[local_rank],
+                HOROVOD_LOCAL_RANK=local_rank,
+                HOROVOD_LOCAL_SIZE=len(ranks))
+            for ranks in node_ranks
+            for local_rank, world_rank in enumerate(ranks)
+        }
+
+    def start_rendezvous_server(self):
+        """Starts the global rendezvous server.
+
+        This does not depend on the registered workers, so it can run in
+        the background while the workers are being created.
+        """
+        rendezvous = RendezvousServer(self.settings.verbose)
+        # start global rendezvous server and get port that it is listening on
+        self.global_rendezv_port = rendezvous.start()
+        self.rendezvous = rendezvous
+
+    def stop_rendezvous_server(self):
+        """Stops the global rendezvous server if it has been started."""
+        if self.rendezvous is not None:
+            self.rendezvous.stop()
+            self.rendezvous = None
+            self.global_rendezv_port = None
 
     def establish_rendezvous(self) -> Dict[str, str]:
-        """Creates the rendezvous server and identifies the nics to be used.
+        """Initializes the rendezvous server with the registered workers.
+
+        Starts the rendezvous server first if that has not happened yet.
 
         Returns:
             Environment variables for each worker.
         """
-
-        # start global rendezvous server and get port that it is listening on
-        self.rendezvous = RendezvousServer(self.settings.verbose)
+        if self.rendezvous is None:
+            self.start_rendezvous_server()
 
         # allocate processes into slots
         # hosts = parse_hosts(hosts_string="10.11.11.11:4,10.11.11.12:4")
@@ -106,12 +209,10 @@ class Coordinator:
         host_alloc_plan = hosts.get_host_assignments(parsed_hosts,
                                                      self.world_size)
 
-        # start global rendezvous server and get port that it is listening on
-        self.global_rendezv_port = self.rendezvous.start()
         self.rendezvous.init(host_alloc_plan)
 
         return {
-            "HOROVOD_GLOO_RENDEZVOUS_ADDR": ray.util.get_node_ip_address(),
+            "HOROVOD_GLOO_RENDEZVOUS_ADDR": _get_driver_ip(),
             "HOROVOD_GLOO_RENDEZVOUS_PORT": str(self.global_rendezv_port),
             "HOROVOD_CONTROLLER": "gloo",
             "HOROVOD_CPU_OPERATIONS": "gloo",
@@ -237,12 +338,38 @@ class RayExecutor:
 
     def _start_executables(self, executable_cls, executable_args,
                            executable_kwargs):
+        # Large arguments are placed in the object store once rather than
+        # serialized again for every worker.
+        executable_cls = put_if_large(executable_cls)
+        executable_args = put_if_large(executable_args)
+        executable_kwargs = put_if_large(executable_kwargs)
+
         def _start_exec(worker):
             return worker.start_executable.remote(
                 executable_cls, executable_args, executable_kwargs)
 
         map_blocking(_start_exec, self.workers)
 
+    def _get_hostnames(self) -> List[str]:
+        """Collects the hostnames of all workers in a single batch.
+
+        All requests are submitted up front and awaited together so that
+        slow actors do not serialize the collection.
+        """
+        hostname_futures = [w.hostname.remote() for w in self.workers]
+        ready, not_ready = ray.wait(
+            hostname_futures,
+            num_returns=len(hostname_futures),
+            timeout=self.settings.timeout_s)
+        if not_ready:
+            raise TimeoutError(
+                "Timed out waiting for workers to start. {} out of {} "
+                "workers reported their hostname within {} seconds.".format(
+                    len(ready), len(hostname_futures),
+                    self.settings.timeout_s))
+        logger.debug(f"Collected hostnames of {len(ready)} workers.")
+        return ray.get(hostname_futures)
+
     def _create_strategy(self):
         assert self.num_workers is None or self.num_hosts is None
         if self.num_workers:
@@ -289,30 +416,50 @@ class RayExecutor:
 
         self.strategy = self._create_strategy()
         self.coordinator = Coordinator(self.settings)
+        # Start the rendezvous server while the workers are being created.
+        # Failures are raised again by `establish_rendezvous`, which
+        # retries starting the server on the driver thread.
+        def _start_rendezvous_server():
+            try:
+                self.coordinator.start_rendezvous_server()
+            except Exception:
+                logger.debug(
+                    "Failed to start the rendezvous server in the "
+                    "background. Retrying on the driver thread.",
+                    exc_info=True)
+
+        rendezvous_thread = in_thread(_start_rendezvous_server)
         executable_args = executable_args or []
-        self.workers, node_workers = self.strategy.create_workers()
-        # Get all the hostnames of all workers
-        hostnames = map_blocking(lambda w: w.hostname.remote(), self.workers)
-        # Register each hostname to the coordinator. assumes the hostname
-        # ordering is the same.
-        for rank, hostname in enumerate(hostnames):
-            self.coordinator.register(hostname, rank)
-        all_info = self.coordinator.finalize_registration()
-
-        indexed_runners = dict(enumerate(self.workers))
-        for rank, local_cross_env_var in all_info.items():
-            indexed_runners[rank].update_env_vars.remote(local_cross_env_var)
-
+        try:
+            self.workers = self.strategy.create_workers()
+            # Get all the hostnames of all workers
+            hostnames = self._get_hostnames()
+            node_workers = self.strategy.get_node_workers(
+                self.workers, hostnames=hostnames)
+            # Register each hostname to the coordinator. assumes the
+            # hostname ordering is the same.
+            self.coordinator.register_all(hostnames)
+            all_info = self.coordinator.finalize_registration()
+        except BaseException:
+            # Do not leave the server listening if the workers never start.
+            rendezvous_thread.join()
+            self.coordinator.stop_rendezvous_server()
+            raise
+
+        rendezvous_thread.join()
         coordinator_envs = self.coordinator.establish_rendezvous()
         coordinator_envs.update(extra_env_vars)
         nics = detect_nics(
             self.settings,
-            all_host_names=list(self.coordinator.hostnames_by_rank),
+            all_host_names=self.coordinator.node_hostnames,
             node_workers=node_workers)
         coordinator_envs.update(nics_to_env_var(nics))
 
-        map_blocking(lambda w: w.update_env_vars.remote(coordinator_envs),
-                     self.workers)
+        # Send the per-rank and the shared env vars in a single update.
+        map_blocking(
+            lambda rank: self.workers[rank].update_env_vars.remote(
+                {**all_info[rank], **coordinator_envs}),
+            range(len(self.workers)))
 
         self._start_executables(executable_cls, executable_args,
                                 executable_kwargs)
@@ -326,7 +473,9 @@ class RayExecutor:
         Returns:
             Deserialized return values from the target function.
         """
-        return ray.get([worker.execute.remote(fn) for worker in self.workers])
+        fn_arg = put_if_large(fn)
+        return ray.get(
+            [worker.execute.remote(fn_arg) for worker in self.workers])
 
     def run(self,
             fn: Callable[[Any], Any],
@@ -365,10 +514,8 @@ class RayExecutor:
         """
         args = args or []
         kwargs = kwargs or {}
-        return [
-            worker.execute.remote(lambda w: fn(*args, **kwargs))
-            for worker in self.workers
-        ]
+        fn_arg = put_if_large(functools.partial(_apply, fn, args, kwargs))
+        return [worker.execute.remote(fn_arg) for worker in self.workers]
 
     def execute_single(self,
                        fn: Callable[["executable_cls"], Any]) -> List[Any]:
@@ -384,8 +531,10 @@ class RayExecutor:
 
     def shutdown(self):
         """Destroys the provided workers."""
+        # Kill all actors right away, even if they are still running tasks.
         for worker in self.workers:
-            del worker
+            ray.kill(worker)
+        self.workers = []
 
         if self.strategy:
             self.strategy.shutdown()
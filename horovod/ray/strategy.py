@@ -1,20 +1,57 @@
+import itertools
 import logging
+import time
 from typing import Dict
 
 import ray
 from horovod.ray.utils import map_blocking
 from horovod.ray.worker import BaseHorovodWorker
 
+try:
+    from ray.util.scheduling_strategies import PlacementGroupSchedulingStrategy
+except ImportError:
+    # Older Ray versions only support the placement group options.
+    PlacementGroupSchedulingStrategy = None
+
 logger = logging.getLogger(__name__)
 
+# Interval at which progress is reported while waiting for placement groups.
+PG_POLL_INTERVAL_S = 5
+
+
+def _placement_group_options(placement_group, bundle_index: int) -> dict:
+    """Actor options scheduling an actor into the given bundle."""
+    if PlacementGroupSchedulingStrategy is None:
+        return dict(
+            placement_group=placement_group,
+            placement_group_bundle_index=bundle_index)
+    return dict(
+        scheduling_strategy=PlacementGroupSchedulingStrategy(
+            placement_group, placement_group_bundle_index=bundle_index))
+
 
 def create_placement_group(resources_per_bundle: Dict[str, int],
                            num_bundles: int, pg_timeout: int,
                            pg_strategy: str):
-    bundles = [resources_per_bundle.copy() for _ in range(num_bundles)]
+    # All bundles are identical and never mutated, so share a single copy.
+    bundles = [resources_per_bundle.copy()] * num_bundles
     pg = ray.util.placement_group(bundles, strategy=pg_strategy)
     logger.debug("Waiting for placement group to start.")
-    ready, _ = ray.wait([pg.ready()], timeout=pg_timeout)
+    ready_ref = pg.ready()
+    # A timeout of None waits indefinitely.
+    deadline = None if pg_timeout is None else time.monotonic() + pg_timeout
+    while True:
+        wait_s = PG_POLL_INTERVAL_S
+        if deadline is not None:
+            wait_s = max(0, min(wait_s, deadline - time.monotonic()))
+        ready, _ = ray.wait([ready_ref], timeout=wait_s)
+        if ready or (deadline is not None
+                     and time.monotonic() >= deadline):
+            break
+        logger.info("Waiting for placement group to start. "
+                    "Resources requested: {} x {}, currently available: "
+                    "{}".format(num_bundles, resources_per_bundle,
+                                ray.available_resources()))
     if ready:
         logger.debug("Placement group has started.")
     else:
@@ -41,12 +78,19 @@ class BaseStrategy:
         raise NotImplementedError
 
     @classmethod
-    def get_node_workers(cls, workers):
-        """Returns list of one worker per node to use for NIC detection."""
+    def get_node_workers(cls, workers, hostnames=None):
+        """Returns list of one worker per node to use for NIC detection.
+
+        Args:
+            workers (list): Ray actors of all workers.
+            hostnames (list): Optional hostnames of the workers, in the same
+                order. If not provided, they are retrieved from the workers.
+        """
 
         # In some setups (i.e., Peloton), ray nodes may not have
         # unique host names.
-        hostnames = map_blocking(lambda w: w.hostname.remote(), workers)
+        if hostnames is None:
+            hostnames = map_blocking(lambda w: w.hostname.remote(), workers)
         host_worker_map = {}
         for hostname, worker in zip(hostnames, workers):
             host_worker_map[hostname] = worker
@@ -95,16 +139,23 @@ class ColocatedStrategy(BaseStrategy):
 
         # STRICT_SPREAD guarantees each bundle is on a different node.
         # Create num_workers_per_host workers per bundle, i.e. per machine.
+        # All workers are created before any GPU ids are fetched so that
+        # actor startup overlaps across nodes.
+        node_workers_per_bundle = []
+        gpu_id_futures_per_bundle = []
+        remote_cls = ray.remote(BaseHorovodWorker)
+        worker_options = dict(
+            num_cpus=self.cpus_per_worker,
+            num_gpus=self.gpus_per_worker * int(self.use_gpu))
         for bundle_index in range(len(bundles)):
             gpu_id_futures = []
             curr_node_workers = []
-            remote_cls = ray.remote(BaseHorovodWorker)
+            # All workers in a bundle share the same options.
+            remote_cls_with_options = remote_cls.options(
+                **worker_options,
+                **_placement_group_options(self.placement_group,
+                                           bundle_index))
             for i in range(self.num_workers_per_host):
-                remote_cls_with_options = remote_cls.options(
-                    num_cpus=self.cpus_per_worker,
-                    num_gpus=self.gpus_per_worker * int(self.use_gpu),
-                    placement_group=self.placement_group,
-                    placement_group_bundle_index=bundle_index)
                 worker = remote_cls_with_options.remote(
                     world_rank=self.num_workers_per_host * bundle_index + i,
                     world_size=self.num_workers)
@@ -112,25 +163,39 @@ class ColocatedStrategy(BaseStrategy):
                     gpu_id_futures.append(worker.get_gpu_ids.remote())
                 self.workers.append(worker)
                 curr_node_workers.append(worker)
+            node_workers_per_bundle.append(curr_node_workers)
+            gpu_id_futures_per_bundle.append(gpu_id_futures)
+
+        all_gpu_ids = ray.get([
+            future for gpu_id_futures in gpu_id_futures_per_bundle
+            for future in gpu_id_futures
+        ])
+
+        futures = []
+        offset = 0
+        for curr_node_workers, gpu_id_futures in zip(
+                node_workers_per_bundle, gpu_id_futures_per_bundle):
             if len(gpu_id_futures) > 0:
                 # By setting CUDA VISIBLE DEVICES to ALL GPUs,
                 # CUDA will be able to detect adjacent devices and use IPC
                 # allowing for better performance.
-                gpu_ids = sum(ray.get(gpu_id_futures), [])
+                gpu_ids = list(
+                    itertools.chain.from_iterable(
+                        all_gpu_ids[offset:offset + len(gpu_id_futures)]))
+                offset += len(gpu_id_futures)
                 # Make sure that each worker on the node has unique device.
                 assert len(gpu_ids) == len(
                     set(gpu_ids)) == self.num_workers_per_host, gpu_ids
                 all_ids = ",".join([str(gpu_id) for gpu_id in gpu_ids])
-                futures = []
                 for worker in curr_node_workers:
                     futures.append(
                         worker.update_env_vars.remote({
                             "CUDA_VISIBLE_DEVICES":
                             all_ids
                         }))
-                ray.get(futures)
+        ray.get(futures)
 
-        return self.workers, self.get_node_workers(self.workers)
+        return self.workers
 
 
 class PackStrategy(BaseStrategy):
@@ -163,16 +228,18 @@ class PackStrategy(BaseStrategy):
         # Placement group has started. Now create the workers.
         self.workers = []
 
+        remote_cls = ray.remote(BaseHorovodWorker)
+        worker_options = dict(
+            num_cpus=self.cpus_per_worker,
+            num_gpus=self.gpus_per_worker * int(self.use_gpu))
         for bundle_index in range(len(bundles)):
-            remote_cls = ray.remote(BaseHorovodWorker)
             remote_cls_with_options = remote_cls.options(
-                num_cpus=self.cpus_per_worker,
-                num_gpus=self.gpus_per_worker * int(self.use_gpu),
-                placement_group=self.placement_group,
-                placement_group_bundle_index=bundle_index)
+                **worker_options,
+                **_placement_group_options(self.placement_group,
+                                           bundle_index))
             worker = remote_cls_with_options.remote(
                 world_rank=bundle_index, world_size=self.num_workers)
 
             self.workers.append(worker)
 
-        return self.workers, self.get_node_workers(self.workers)
+        return self.workers
@@ -1,5 +1,6 @@
 from typing import List, Optional, Callable, Any, Dict
 from contextlib import contextmanager
+import cloudpickle
 import ray
 
 from horovod.runner.driver import driver_service
@@ -45,6 +46,8 @@ def detect_nics(settings,
 
     If 'all_host_names' includes a remote hostname, Horovod will run a nic
     detection scheme that pings each adjacent host to find the right nic.
+    The scheme is skipped, without any remote calls, if 'settings.nics' is
+    already set or if all hosts are local to the driver.
 
     Args:
         settings: Horovod Settings object.
@@ -89,3 +92,21 @@ def nics_to_env_var(nics: List[str]) -> Dict[str, str]:
 
 def map_blocking(fn, collection):
     return ray.get([fn(w) for w in collection])
+
+
+# Ray inlines task arguments up to this size (its default
+# max_direct_call_object_size) into the task spec.
+MAX_INLINE_ARG_BYTES = 100 * 1024
+
+
+def put_if_large(value: Any) -> Any:
+    """Returns an ObjectRef to `value` if it is too large to be inlined.
+
+    Large arguments passed to many workers are then serialized only once,
+    while small ones are still passed by value, which is cheaper.
+    """
+    if value is None:
+        return value
+    if len(cloudpickle.dumps(value)) > MAX_INLINE_ARG_BYTES:
+        return ray.put(value)
+    return value
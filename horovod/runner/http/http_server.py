@@ -198,6 +198,7 @@ class RendezvousServer:
     def stop(self):
         self._httpd.shutdown()
         self._listen_thread.join()
+        self._httpd.server_close()
 
 
 class KVStoreHTTPServer(HTTPServer, object):
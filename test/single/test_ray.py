@@ -6,12 +6,14 @@ import os
 import sys
 
 import socket
+import time
 import pytest
 import ray
 import torch
 
 from horovod.common.util import gloo_built
 from horovod.ray.runner import (Coordinator, MiniSettings, RayExecutor)
+from horovod.ray.utils import MAX_INLINE_ARG_BYTES, put_if_large
 from horovod.ray.worker import BaseHorovodWorker
 
 sys.path.append(os.path.dirname(__file__))
@@ -57,7 +59,6 @@ def check_resources(original_resources):
             return True
         else:
             print(ray.available_resources())
-            import time
             time.sleep(0.5)
     return False
 
@@ -122,6 +123,55 @@ def test_cross_rank():
     assert len(cross_size_3) == 9
 
 
+def test_coordinator_register_all():
+    settings = MiniSettings()
+    hostnames = ["host1"] * 5 + ["host2"] * 4 + ["host3"] * 3
+
+    coord = Coordinator(settings)
+    for rank, hostname in enumerate(hostnames):
+        coord.register(hostname, world_rank=rank)
+
+    bulk_coord = Coordinator(settings)
+    bulk_coord.register_all(hostnames)
+    assert bulk_coord.world_size == coord.world_size == 12
+    assert bulk_coord.hoststring == coord.hoststring == \
+        "host1:5,host2:4,host3:3"
+    assert bulk_coord.finalize_registration() == \
+        coord.finalize_registration()
+
+    # Registering again would duplicate world ranks.
+    with pytest.raises(AssertionError):
+        bulk_coord.register_all(hostnames)
+    with pytest.raises(AssertionError):
+        coord.register_all(hostnames)
+
+
+def test_coordinator_registration_order():
+    settings = MiniSettings()
+    coord = Coordinator(settings)
+    # Hosts are not in lexicographic order, interleaved, and ranks are
+    # registered out of order.
+    for hostname, rank in [("b", 3), ("a", 0), ("b", 1), ("c", 4),
+                           ("a", 2)]:
+        coord.register(hostname, world_rank=rank)
+
+    assert coord.world_size == 5
+    assert coord.hoststring == "b:2,a:2,c:1"
+    assert coord.node_hostnames == ["b", "a", "c"]
+    assert coord.finalize_registration() == {
+        3: dict(HOROVOD_CROSS_RANK=0, HOROVOD_CROSS_SIZE=3,
+                HOROVOD_LOCAL_RANK=0, HOROVOD_LOCAL_SIZE=2),
+        1: dict(HOROVOD_CROSS_RANK=0, HOROVOD_CROSS_SIZE=2,
+                HOROVOD_LOCAL_RANK=1, HOROVOD_LOCAL_SIZE=2),
+        0: dict(HOROVOD_CROSS_RANK=1, HOROVOD_CROSS_SIZE=3,
+                HOROVOD_LOCAL_RANK=0, HOROVOD_LOCAL_SIZE=2),
+        2: dict(HOROVOD_CROSS_RANK=1, HOROVOD_CROSS_SIZE=2,
+                HOROVOD_LOCAL_RANK=1, HOROVOD_LOCAL_SIZE=2),
+        4: dict(HOROVOD_CROSS_RANK=2, HOROVOD_CROSS_SIZE=3,
+                HOROVOD_LOCAL_RANK=0, HOROVOD_LOCAL_SIZE=1),
+    }
+
+
 # Used for Pytest parametrization.
 parameter_str = "num_workers,num_hosts,num_workers_per_host"
 ray_executor_parametrized = [(4, None, None), (None, 1, 4)]
@@ -142,6 +192,35 @@ def test_infeasible_placement(ray_start_2_cpus, num_workers, num_hosts,
     hjob.shutdown()
 
 
+def test_hostname_timeout(ray_start_2_cpus):
+    class SlowHostnameWorker(BaseHorovodWorker):
+        def __init__(self, slow, **kwargs):
+            super().__init__(**kwargs)
+            # Set after the base class init, which calls `hostname`, so
+            # only the later `hostname` calls hang.
+            self.slow = slow
+
+        def hostname(self):
+            if getattr(self, "slow", False):
+                time.sleep(60)
+            return super().hostname()
+
+    setting = RayExecutor.create_settings(timeout_s=2)
+    hjob = RayExecutor(setting, num_workers=2)
+    remote_cls = ray.remote(SlowHostnameWorker)
+    hjob.workers = [
+        remote_cls.remote(slow=rank == 1, world_rank=rank, world_size=2)
+        for rank in range(2)
+    ]
+    # Make sure both actors are up so only the hanging call times out.
+    ray.get([w.env_vars.remote() for w in hjob.workers])
+
+    with pytest.raises(TimeoutError, match="1 out of 2 workers"):
+        hjob._get_hostnames()
+    for worker in hjob.workers:
+        ray.kill(worker)
+
+
 @pytest.mark.skipif(
     torch.cuda.device_count() < 4, reason="GPU test requires 4 GPUs")
 @pytest.mark.skipif(
@@ -172,6 +251,17 @@ def test_horovod_mixin(ray_start_2_cpus):
     assert ray.get(actor.env_vars.remote())["TEST"] == str(DUMMY_VALUE)
 
 
+def test_put_if_large(ray_start_2_cpus):
+    small = {"epochs": 2}
+    assert put_if_large(None) is None
+    assert put_if_large(small) is small
+
+    large = b"x" * (MAX_INLINE_ARG_BYTES + 1)
+    large_ref = put_if_large(large)
+    assert isinstance(large_ref, ray.ObjectRef)
+    assert ray.get(large_ref) == large
+
+
 @pytest.mark.parametrize(parameter_str, ray_executor_parametrized)
 def test_local(ray_start_4_cpus, num_workers, num_hosts, num_workers_per_host):
     original_resources = ray.available_resources()